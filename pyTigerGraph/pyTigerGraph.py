@@ -1,13 +1,166 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import copy
+import hashlib
 import json
+import logging
 import re
 from datetime import datetime
 import time
+import itertools
 import pandas as pd
 import os
 import subprocess
 import urllib.parse
 import shutil
+import string
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used if it is not installed
+    orjson = None
+
+_logger = logging.getLogger(__name__)
+
+# Separators of the GSQL client output in debug mode
+_STDOUT_BANNER = "-- stdout " + "-" * 70
+_STDERR_BANNER = "-- stderr " + "-" * 70
+_BANNER_END = "-" * 80
+
+# Interpreted query used by getEdgesByType() if the ttk_getEdgesFrom query is not installed
+_GET_EDGES_QUERY = string.Template(
+    'INTERPRET QUERY () FOR GRAPH $graph { '
+    '    SetAccum<EDGE> @@edges; '
+    '    start = {ANY}; '
+    '    res = '
+    '        SELECT s '
+    '        FROM   start:s-(:e)->ANY:t '
+    '        WHERE  e.type == "$edgeType" '
+    '           AND s.type == "$sourceEdgeType" '
+    '        ACCUM  @@edges += e; '
+    '    PRINT @@edges AS edges; '
+    '}')
+
+# Frequently used regular expressions, compiled once
+_JSON_RE = re.compile(r"[{\[].*\Z", re.DOTALL)  # The JSON document at the end of the GSQL client output
+_VER_RE = re.compile(r"_.+_")  # The version number in a component's version string (e.g. release_3.0.5_05-14-2020)
+_SECRET_RE = re.compile(r"The secret: (\w*)")
+_QUERY_DEF_RE = re.compile(r"^CREATE\s+(?:OR\s+REPLACE\s+)?(?:DISTRIBUTED\s+)?QUERY\s+(\w+)", re.MULTILINE)  # The first line of a query definition
+_FILENAME_DEF_RE = re.compile(r"define\s+filename\s+(.+?);", re.IGNORECASE)  # DEFINE FILENAME statements of loading jobs
+_ASSIGNMENT_RE = re.compile(r"\s+=\s+")
+_IDENT_LIST_RE = re.compile(r"[\w\s,.+\-]+\Z")  # A comma separated list of (optionally signed) attribute names, as used in `select` and `sort`
+
+
+def _encode(obj, indent=False):
+    """Serialises an object to JSON, using orjson if available.
+
+    Returns UTF-8 encoded bytes if orjson was used, otherwise an (ASCII-only) string; `requests` accepts both as request payload.
+
+    Arguments:
+    - `obj`:    The object to serialise.
+    - `indent`: Pretty-print the output (with 2-space indentation)?
+    """
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:  # E.g. integers out of 64-bit range; let the standard library handle these
+            pass
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _dumps(obj, indent=False):
+    """Serialises an object to a JSON string, using orjson if available.
+
+    For argument details, see `_encode`.
+    """
+    ret = _encode(obj, indent)
+    if isinstance(ret, bytes):
+        return ret.decode()
+    return ret
+
+
+def _loads(doc):
+    """Parses a JSON document (string or UTF-8 encoded bytes), using orjson if available.
+
+    Arguments:
+    - `doc`: The JSON document to parse.
+    """
+    if orjson:
+        try:
+            return orjson.loads(doc)
+        except ValueError:  # E.g. NaN or Infinity values that orjson rejects; let the standard library handle these
+            pass
+    if isinstance(doc, (bytes, bytearray)):
+        doc = doc.decode("utf-8")
+    return json.loads(doc)
+
+
+def _newSession(poolSize):
+    """Creates an HTTP session with a connection pool of the given size (per host)."""
+    # All HTTP requests of a session reuse its connections, so that TCP/TLS connections are kept alive
+    # Failed connection attempts and transient gateway errors are retried with backoff; POST requests (e.g. upserts, queries)
+    #   are not retried on error responses as they might have been (partially) processed already
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=poolSize, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _queryString(params):
+    """Builds a URL query string (with the leading "?") from the parameters that have a value; returns "" if none of them has.
+
+    Arguments:
+    - `params`: A list of (name, value) tuples; parameters with an empty or `None` value are omitted.
+    """
+    params = [(k, v) for k, v in params if v]
+    if not params:
+        return ""
+    return "?" + urllib.parse.urlencode(params, safe=",", quote_via=urllib.parse.quote)
+
+
+def _checkIdentList(name, value):
+    """Raises an exception if `value` is not a valid attribute list, so that malformed requests fail without a round trip.
+
+    Arguments:
+    - `name`:  The name of the parameter (for the error message).
+    - `value`: The value of the parameter; an empty value is accepted, as it is omitted from the request.
+    """
+    if value and not _IDENT_LIST_RE.match(value):
+        raise TigerGraphException("Invalid value for '" + name + "': " + value, None)
+
+
+def _queryHeaders(timeout, sizeLimit):
+    """Returns the request headers for the query execution limits, or `None` if no limit is specified.
+
+    Arguments:
+    - `timeout`:   Maximum duration for successful query execution (in milliseconds).
+    - `sizeLimit`: Maximum size of response (in bytes).
+    """
+    if not timeout and not sizeLimit:
+        return None
+    headers = {}
+    if timeout:
+        headers["GSQL-TIMEOUT"] = str(timeout)
+    if sizeLimit:
+        headers["RESPONSE-LIMIT"] = str(sizeLimit)
+    return headers
+
+
+def _parallel(fn, args, maxWorkers=8):
+    """Calls `fn` for each item of `args` concurrently (in threads) and returns the results in the order of `args`.
+
+    Used for issuing independent REST requests; exceptions raised by any of the calls are propagated.
+    """
+    if len(args) < 2:
+        return [fn(a) for a in args]
+    with ThreadPoolExecutor(max_workers=min(len(args), maxWorkers)) as executor:
+        return list(executor.map(fn, args))
 
 
 class TigerGraphException(Exception):
@@ -32,7 +185,11 @@ class TigerGraphConnection(object):
                                                             Use `getEdgeTypes()` to fetch the list of edge types currently in the graph.
     """
 
-    def __init__(self, host="http://localhost", graphname="MyGraph", username="tigergraph", password="tigergraph", restppPort="9000", gsPort="14240", apiToken="", gsqlVersion="", gsqlPath="", useCert=False, certPath=""):
+    _sessionLock = threading.Lock()  # Guards the lazy creation of HTTP sessions
+    _sharedSessions = {}  # "scheme://host" -> HTTP session shared by the instances created with `shareSession=True`
+    _schemaCache = {}  # (GSQL server URL, graph name, username, password hash) -> vertex and edge schema of the graph; see `getSchema`
+
+    def __init__(self, host="http://localhost", graphname="MyGraph", username="tigergraph", password="tigergraph", restppPort="9000", gsPort="14240", apiToken="", gsqlVersion="", gsqlPath="", useCert=False, certPath="", poolSize=20, shareSession=False):
         """Initiate a connection object.
 
         Arguments
@@ -54,23 +211,37 @@ class TigerGraphConnection(object):
                                Cloud). This needs to be False when connecting to an unsecure server such as a TigerGraph Developer instance.
                                When True the certificate would be downloaded when it is first needed.
         - `certPath`:          The folder/directory _and_ the name of the SSL certification file where the certification should be stored.
+        - `poolSize`:          The maximum number of HTTP connections (per host) kept open for reuse. Increase it if the connection object
+                               is used by many threads concurrently.
+        - `shareSession`:      If True, the HTTP connections are shared with all other connection objects created with this option for
+                               the same host (e.g. for different graphs), instead of each object opening its own ones. The pool size of
+                               the shared connections is determined by the object that first sends a request.
         """
 
         self.tgLocation = urllib.parse.urlparse(host)
         self.host = self.tgLocation.scheme + "://" + self.tgLocation.netloc
         self.username = username
         self.password = password
-        self.graphname = graphname
         self.restppPort = str(restppPort)
         self.restppUrl = self.host + ":" + self.restppPort
+        self.graphname = graphname  # Also sets the graph specific endpoint URL prefixes, see the `graphname` property
         self.gsPort = str(gsPort)
         self.gsUrl = self.host + ":" + self.gsPort
         self.serverUrl = self.tgLocation.netloc + ":" + self.gsPort
         self.apiToken = apiToken
         self.authHeader = {'Authorization': "Bearer " + self.apiToken}
-        self.debug = False
+        self._tokenCache = {}  # (secret, lifetime) -> token details returned by getToken, reused while valid
+        self._debug = False
         self.schema = None
+        self._schemaGraph = None  # The graph the cached schema belongs to
+        self._schemaIndex = {}  # Lookup tables (e.g. name -> details of vertex and edge types) derived from the cached schema
         self.ttkGetEF = None  # TODO: this needs to be rethought, or at least renamed
+        self._versions = None  # Component versions returned by getVersion()
+        self._versionIndex = {}  # Component name -> version lookup table
+
+        self._httpSession = None  # Created on first use, see `_session`
+        self._poolSize = poolSize
+        self._shareSession = shareSession
 
         self.gsqlInitiated = False
         self.gsqlVersion = gsqlVersion
@@ -79,6 +250,7 @@ class TigerGraphConnection(object):
             self.gsqlPath = os.path.join("~", ".tigergraph")
         self.gsqlPath = os.path.expanduser(self.gsqlPath)
         self.jarName = ""
+        self._gsqlCmd = []  # The invariant part of the GSQL client command line, built by initGsql()
 
         self.certDownloaded = False
         self.useCert = useCert  # TODO: if self.tgLocation.scheme == 'https' and userCert == False, should we throw exception here or let it be thrown later when gsql is called?
@@ -86,18 +258,90 @@ class TigerGraphConnection(object):
         if not self.certPath:
             self.certPath = os.path.join("~", ".tigergraph", self.tgLocation.netloc.replace(".", "_") + "-" + self.graphname + "-cert.txt")
         self.certPath = os.path.expanduser(self.certPath)
-        self.downloadCertificate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the HTTP connections kept open for reuse by this connection object.
+
+        The object can still be used afterwards; new connections are opened when needed.
+        Alternatively, use the connection object as a context manager: `with TigerGraphConnection(...) as conn: ...`
+        Shared connections (see `shareSession`) are not closed as other objects might still use them.
+        """
+        if self._httpSession is not None and not self._shareSession:
+            self._httpSession.close()
+
+    @property
+    def debug(self):
+        """Is debug output enabled?
+
+        Debug output is enabled either by setting this property to `True` (then the messages are printed to standard output) or by
+            enabling the DEBUG level for the `pyTigerGraph.pyTigerGraph` logger (then the messages are passed to that logger).
+        """
+        return self._debug or _logger.isEnabledFor(logging.DEBUG)
+
+    @debug.setter
+    def debug(self, debug):
+        self._debug = debug
+
+    def _log(self, msg, *args):
+        """Emits a debug message; call it only if `debug` is true.
+
+        Arguments:
+        - `msg`:  The message; as with `logging`, it is %-formatted with `args` only if it is actually emitted.
+        - `args`: The arguments of the message.
+        """
+        if self._debug:
+            print(msg % args if args else msg)
+        else:
+            _logger.debug(msg, *args)
+
+    @property
+    def graphname(self):
+        """The default graph for running queries (and all other graph specific operations)."""
+        return self._graphname
+
+    @graphname.setter
+    def graphname(self, graphname):
+        self._graphname = graphname
+        # Endpoint URL prefixes used by many functions, built once per graph
+        self._graphUrl = self.restppUrl + "/graph/" + graphname
+        self._builtinsUrl = self.restppUrl + "/builtins/" + graphname
+        self._queryUrl = self.restppUrl + "/query/" + graphname + "/"
 
     # Private functions ========================================================
 
+    @property
+    def _session(self):
+        """The HTTP session used for all requests; created when it is first needed, so that instantiating the class is cheap."""
+        if self._httpSession is None:
+            with self._sessionLock:
+                if self._httpSession is None:
+                    if self._shareSession:
+                        session = self._sharedSessions.get(self.host)
+                        if session is None:
+                            session = _newSession(self._poolSize)
+                            self._sharedSessions[self.host] = session
+                    else:
+                        session = _newSession(self._poolSize)
+                    self._httpSession = session
+        return self._httpSession
+
     def _errorCheck(self, res):
         """Checks if the JSON document returned by an endpoint has contains error: true; if so, it raises an exception.
 
         Arguments
         - `res`:  The JSON document returned by an endpoint
         """
-        if "error" in res and res["error"] and res["error"] != "false":  # Endpoint might return string "false" rather than Boolean false
-            raise TigerGraphException(res["message"], (res["code"] if "code" in res else None))
+        if not isinstance(res, dict):  # Some endpoints return a list or a scalar
+            return
+        err = res.get("error")
+        if err and err != "false":  # Endpoint might return string "false" rather than Boolean false
+            raise TigerGraphException(res.get("message"), res.get("code"))
 
     def _req(self, method, url, authMode="token", headers=None, data=None, resKey="results", skipCheck=False, params=None):
         """Generic REST++ API request
@@ -113,7 +357,14 @@ class TigerGraphConnection(object):
         - `params`:    Request URL parameters.
         """
         if self.debug:
-            print(method + " " + url + ("\n" + json.dumps(data, indent=2) if data else ""))
+            # Payloads are usually passed already serialised; those are printed as they are, not re-encoded
+            if isinstance(data, (bytes, bytearray)):
+                _data = data.decode()
+            elif data and not isinstance(data, str):
+                _data = _dumps(data, indent=True)
+            else:
+                _data = data
+            self._log("%s %s%s", method, url, "\n" + _data if _data else "")
         if authMode == "pwd":
             _auth = (self.username, self.password)
         else:
@@ -123,6 +374,7 @@ class TigerGraphConnection(object):
         else:
             _headers = {}
         if headers:
+            _headers = _headers.copy()  # The connection's authHeader must not be modified by request-specific headers
             _headers.update(headers)
         if method == "POST":
             _data = data  # TODO: check content type and convert from JSON if necessary
@@ -130,23 +382,23 @@ class TigerGraphConnection(object):
             _data = None
 
         if False and self.useCert and self.certDownloaded:
-            res = requests.request(method, url, auth=_auth, headers=_headers, data=_data, params=params, verify=self.certPath)
+            res = self._session.request(method, url, auth=_auth, headers=_headers, data=_data, params=params, verify=self.certPath)
         else:
-            res = requests.request(method, url, auth=_auth, headers=_headers, data=_data, params=params)
+            res = self._session.request(method, url, auth=_auth, headers=_headers, data=_data, params=params)
 
         if self.debug:
-            print(res.url)
+            self._log(res.url)
         if res.status_code != 200:
             res.raise_for_status()
-        res = json.loads(res.text)
+        res = _loads(res.content)  # Responses are always UTF-8 encoded; parsing the raw content avoids character set detection
         if not skipCheck:
             self._errorCheck(res)
         if not resKey:
             if self.debug:
-                print(res)
+                self._log(res)
             return res
         if self.debug:
-            print(res[resKey])
+            self._log(res[resKey])
         return res[resKey]
 
     def _get(self, url, authMode="token", headers=None, resKey="results", skipCheck=False, params=None):
@@ -170,18 +422,25 @@ class TigerGraphConnection(object):
         """
         return self._req("DELETE", url, authMode)
 
+    def _edgesUrl(self, sourceVertexType, sourceVertexId, edgeType=None, targetVertexType=None, targetVertexId=None):
+        """Builds the URL of the /graph/{graph_name}/edges endpoint for the given (partial) edge specification.
+
+        For argument details, see `getEdges`.
+        """
+        parts = [self._graphUrl, "edges", sourceVertexType, str(sourceVertexId)]
+        if edgeType:
+            parts.append(edgeType)
+            if targetVertexType:
+                parts.append(targetVertexType)
+                if targetVertexId:
+                    parts.append(str(targetVertexId))
+        return "/".join(parts)
+
     def _upsertAttrs(self, attributes):
         """Transforms attributes (provided as a table) into a hierarchy as expect by the upsert functions."""
         if not isinstance(attributes, dict):
             return {}
-        vals = {}
-        for attr in attributes:
-            val = attributes[attr]
-            if isinstance(val, tuple):
-                vals[attr] = {"value": val[0], "op": val[1]}
-            else:
-                vals[attr] = {"value": val}
-        return vals
+        return {attr: ({"value": val[0], "op": val[1]} if isinstance(val, tuple) else {"value": val}) for attr, val in attributes.items()}
 
     # Schema related functions =================================================
 
@@ -207,8 +466,11 @@ class TigerGraphConnection(object):
         for objType in ["VertexTypes", "EdgeTypes", "Indexes", "Queries", "LoadingJobs", "DataSources", "Graphs"]:
             if objType not in self.schema:
                 self.schema[objType] = []
-
-        qpatt = re.compile("[\s\S\n]+CREATE", re.MULTILINE)
+        # Name -> details indexes of the schema objects whose details are extended with the definition statements found in the output
+        vts = {v["Name"]: v for v in self.schema["VertexTypes"]}
+        ets = {e["Name"]: e for e in self.schema["EdgeTypes"]}
+        qs = {q["Name"]: q for q in self.schema["Queries"]}
+        us = {u["Name"]: u for u in self.schema.get("UDTs", [])}
 
         res = res.split("\n")
         i = 0
@@ -216,21 +478,15 @@ class TigerGraphConnection(object):
             l = res[i]
             # Processing vertices
             if l.startswith("  - VERTEX"):
-                vs = self.schema["VertexTypes"]
-                vtName = l[11:l.find("(")]
-                for v in vs:
-                    if v["Name"] == vtName:
-                        v["Statement"] = "CREATE " + l[4:]
-                        break
+                v = vts.get(l[11:l.find("(")])
+                if v is not None:
+                    v["Statement"] = "CREATE " + l[4:]
 
             # Processing edges
             elif l.startswith("  - DIRECTED") or l.startswith("  - UNDIRECTED"):
-                es = self.schema["EdgeTypes"]
-                etName = l[l.find("EDGE") + 5:l.find("(")]
-                for e in es:
-                    if e["Name"] == etName:
-                        e["Statement"] = "CREATE " + l[4:]
-                        break
+                e = ets.get(l[l.find("EDGE") + 5:l.find("(")])
+                if e is not None:
+                    e["Statement"] = "CREATE " + l[4:]
 
             # Processing indices (or indexes)
             elif l.startswith("Indexes:"):
@@ -260,10 +516,8 @@ class TigerGraphConnection(object):
                 txt = txt.rstrip(" \n")
 
                 fds = []
-                fd = re.findall("define\s+filename\s+.+?;", txt.replace("\n", " "), re.IGNORECASE)
-                for f in fd:
-                    tmp = re.sub("define\s+filename\s+", "", f, 0, re.IGNORECASE).rstrip(";")
-                    tmp = re.split("\s+=\s+", tmp)
+                for f in _FILENAME_DEF_RE.findall(txt.replace("\n", " ")):
+                    tmp = _ASSIGNMENT_RE.split(f)
                     if len(tmp) == 2:
                         tmp = (tmp[0], tmp[1])
                     else:
@@ -277,23 +531,22 @@ class TigerGraphConnection(object):
             elif l.startswith("Queries:"):
                 i += 1
                 l = res[i]
+                qNames = []
                 while l != "":
-                    qName = l[4:l.find("(")]
-                    dep = l.endswith('(deprecated)')
-                    txt = self.gsql("SHOW QUERY " + qName).rstrip(" \n")
-                    txt = re.sub(qpatt, "CREATE", txt)
-                    qs = self.schema["Queries"]
-                    found = False
-                    for q in qs:
-                        if q["Name"] == qName:
-                            q["Statement"] = txt
-                            q["Deprecated"] = dep
-                            found = True
-                            break
-                    if not found:  # Most likely the query is created but not installed
-                        qs.append({"Name": qName, "Statement": txt, "Deprecated": dep})
+                    qNames.append((l[4:l.find("(")], l.endswith('(deprecated)')))
                     i = i + 1
                     l = res[i]
+                txts = self._getQueryTexts([qName for qName, _ in qNames])
+                for qName, dep in qNames:
+                    txt = txts[qName]
+                    q = qs.get(qName)
+                    if q is not None:
+                        q["Statement"] = txt
+                        q["Deprecated"] = dep
+                    else:  # Most likely the query is created but not installed
+                        q = {"Name": qName, "Statement": txt, "Deprecated": dep}
+                        self.schema["Queries"].append(q)
+                        qs[qName] = q
 
             # Processing UDTs
             elif l.startswith("User defined tuples:"):
@@ -301,11 +554,9 @@ class TigerGraphConnection(object):
                 l = res[i]
                 while l != "":
                     udtName = l[4:l.find("(")].rstrip()
-                    us = self.schema["UDTs"]
-                    for u in us:
-                        if u["Name"] == udtName:
-                            u["Statement"] = "TYPEDEF TUPLE <" + l[l.find("(")+1:-1] + "> " + udtName
-                            break
+                    u = us.get(udtName)
+                    if u is not None:
+                        u["Statement"] = "TYPEDEF TUPLE <" + l[l.find("(")+1:-1] + "> " + udtName
                     i = i + 1
                     l = res[i]
 
@@ -334,6 +585,31 @@ class TigerGraphConnection(object):
                 pass
             i += 1
 
+    def _getQueryTexts(self, qNames):
+        """Retrieves the definition of the given queries.
+
+        All queries are requested with a single GSQL command (each `gsql` call starts a new GSQL client process); any query whose
+            definition could not be found in that output is requested separately.
+
+        Arguments:
+        - `qNames`: The names of the queries.
+
+        Returns: A dictionary of <query_name>: <query_definition> pairs.
+        """
+        ret = {}
+        if len(qNames) > 1:
+            res = self.gsql("\n".join(["SHOW QUERY " + qName for qName in qNames]))
+            defs = list(_QUERY_DEF_RE.finditer(res))
+            for d, nxt in zip(defs, defs[1:] + [None]):
+                txt = res[d.start():nxt.start() if nxt else len(res)]
+                ret[d.group(1)] = txt[:txt.rfind("}") + 1] if "}" in txt else txt.rstrip(" \n")
+        for qName in qNames:
+            if qName not in ret:
+                txt = self.gsql("SHOW QUERY " + qName).rstrip(" \n")
+                d = _QUERY_DEF_RE.search(txt)
+                ret[qName] = txt[d.start():] if d else txt  # Dropping any text preceding the query definition
+        return ret
+
     # TODO: GET /gsqlserver/gsql/queryinfo
     #       https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-gsqlserver-gsql-queryinfo-get-query-metadata 
     def _getQueries(self):
@@ -342,22 +618,18 @@ class TigerGraphConnection(object):
         It will not return data for queries that are not (yet) installed.
         """
         qs = self.schema["Queries"]
+        qIdx = {q["Name"]: q for q in qs}
         eps = self.getEndpoints(dynamic=True)
         for ep in eps:
             e = eps[ep]
             params = e["parameters"]
             qName = params["query"]["default"]
-            query = {}
-            found = False
             # Do we have this query already on our list?
-            for q in qs:
-                if q["Name"] == qName:
-                    query = q
-                    found = True
-                    break
-            if not found:  # Most likely the query is created but not installed; add to our list
+            query = qIdx.get(qName)
+            if query is None:  # Most likely the query is created but not installed; add to our list
                 query = {"Name": qName}
                 qs.append(query)
+                qIdx[qName] = query
             params.pop("query")
             query["Parameters"] = params
             query["Endpoint"] = ep.split(" ")[1]
@@ -428,45 +700,100 @@ class TigerGraphConnection(object):
         - `full`:  If `True`, metadata for all kinds of graph objects are retrieved, not just for vertices and edges.
         - `force`: If `True`, retrieves the schema details again, otherwise returns a cached copy of the schema details (if they were already fetched previously).
 
+        The vertex and edge schema of a graph is also cached across connection objects (in the same process) that use the same credentials;
+            a connection object without a cached schema checks the schema version only and reuses the schema fetched by another object
+            if it is still current. As the version check needs no password, the schema is only shared between objects with the same
+            username and password, i.e. the schema is always retrieved (and the credentials checked) at least once with those credentials.
+
         Endpoint:      GET /gsqlserver/gsql/schema
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-the-graph-schema-get-gsql-schema
         """
+        if self._schemaGraph != self.graphname:  # The graph was switched since the schema was cached
+            self.schema = None
         if not self.schema or force:
-            self.schema = self._get(self.gsUrl + "/gsqlserver/gsql/schema?graph=" + self.graphname, authMode="pwd")
-            ret = self._get(self.restppUrl + "/graph/" + self.graphname + "/vertices/dummy", resKey="", skipCheck=True)
-            self.schema["Version"] = ret["version"]["schema"]
+            self._schemaGraph = self.graphname
+            self._schemaIndex = {}
+            cacheKey = (self.gsUrl, self.graphname, self.username, hashlib.sha256(self.password.encode("utf-8")).hexdigest())
+            schema = None
+            ret = None
+            cached = self._schemaCache.get(cacheKey)
+            if cached and not force:
+                # The version probe is much cheaper than retrieving the schema
+                ret = self._get(self._graphUrl + "/vertices/dummy", resKey="", skipCheck=True)
+                if ret["version"]["schema"] == cached["Version"]:
+                    schema = copy.deepcopy(cached)  # The cached copy must not be affected by changes to the returned one
+            if schema is None:
+                if ret is None:
+                    schema, ret = _parallel(lambda fn: fn(), [
+                        lambda: self._get(self.gsUrl + "/gsqlserver/gsql/schema?graph=" + self.graphname, authMode="pwd"),
+                        lambda: self._get(self._graphUrl + "/vertices/dummy", resKey="", skipCheck=True)])
+                else:  # Stale cache entry; the version is already known from the probe
+                    schema = self._get(self.gsUrl + "/gsqlserver/gsql/schema?graph=" + self.graphname, authMode="pwd")
+                schema["Version"] = ret["version"]["schema"]
+                # Only the vertex and edge schema is shared; other metadata (e.g. queries) can change without a schema version change
+                self._schemaCache[cacheKey] = copy.deepcopy(schema)
+            self.schema = schema
         if full:
-            if "UDTs" not in self.schema or force:
-                self._getUDTs()
-            if "Queries" not in self.schema or force:
-                self._getSchemaLs()
-                self._getQueries()
+            getUDTs = "UDTs" not in self.schema or force
+            getQueries = "Queries" not in self.schema or force
+            tasks = []
+            if getUDTs or getQueries:
+                def getUDTsAndQueries():
+                    # These depend on each other: processing the `ls` output needs the UDTs, and query metadata is merged into the
+                    #   list of queries collected from the `ls` output
+                    if getUDTs:
+                        self._getUDTs()
+                    if getQueries:
+                        self._getSchemaLs()
+                        self._getQueries()
+                tasks.append(getUDTsAndQueries)
             if "Users" not in self.schema or force:
-                self._getUsers()
+                tasks.append(self._getUsers)
             if "Groups" not in self.schema or force:
-                self._getGroups()
+                tasks.append(self._getGroups)
+            if len(tasks) > 1 and not self.gsqlInitiated:
+                self.initGsql()  # Set up once, before the concurrent GSQL calls
+            _parallel(lambda fn: fn(), tasks)
         return self.schema
 
+    def _getSchemaObject(self, objType, name, force=False):
+        """Returns the details of a vertex or edge type from the (cached) schema.
+
+        Arguments:
+        - `objType`: The schema object type: "VertexTypes" or "EdgeTypes".
+        - `name`:    The name of the vertex or edge type.
+        - `force`:   If `True`, forces the retrieval the schema details again.
+        """
+        schema = self.getSchema(full=False, force=force)
+        idx = self._schemaIndex.get(objType)
+        if idx is None:
+            idx = {o["Name"]: o for o in schema[objType]}
+            self._schemaIndex[objType] = idx
+        return idx.get(name, {})
+
     def getSchemaVersion(self, force=False):
         """Retrieves the schema version."""
-        return self.getSchema(force=force)["Version"]
+        return self.getSchema(full=False, force=force)["Version"]
+
+    def _getCachedUDTs(self):
+        """Returns the UDT metadata, retrieving only the UDT list (not the full schema) if it was not fetched previously."""
+        schema = self.getSchema(full=False)
+        if "UDTs" not in schema:
+            self._getUDTs()
+        return schema["UDTs"]
 
     def getUDTs(self):
         """Returns the list of User Defined Types (names only)."""
-        if "UDTs" not in self.schema:
-            self.getSchema()
         ret = []
-        for udt in self.schema["UDTs"]:
-            ret.append(udt["name"])
+        for udt in self._getCachedUDTs():
+            ret.append(udt["Name"])
         return ret
 
     def getUDT(self, udtName):
         """Returns the details of a specific User Defined Type."""
-        if "UDTs" not in self.schema:
-            self.getSchema()
-        for udt in self.schema["UDTs"]:
-            if udt["name"] == udtName:
-                return udt["fields"]
+        for udt in self._getCachedUDTs():
+            if udt["Name"] == udtName:
+                return udt["Fields"]
         return []  # UDT was not found
 
     def dropAll(self):
@@ -485,14 +812,17 @@ class TigerGraphConnection(object):
     def upsertData(self, data):
         """Upserts data (vertices and edges) from a JSON document or equivalent object structure.
 
+        Arguments:
+        - `data`: The data to upsert; an object structure, or a JSON document as a string or as UTF-8 encoded bytes (the latter is sent as is).
+
         Endpoint:      POST /graph
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-the-graph-schema-get-gsql-schema
         """
-        if not isinstance(data, str):
-            data = json.dumps(data)
-        if self.debug:
-            print(data)
-        return self._post(self.restppUrl + "/graph/" + self.graphname, data=data)[0]
+        if isinstance(data, str):
+            data = data.encode("utf-8")  # `requests` would send it Latin-1 encoded
+        elif not isinstance(data, (bytes, bytearray)):
+            data = _encode(data)
+        return self._post(self._graphUrl, data=data)[0]
 
     def clearGraphStore(self):
         """Clears the graph store; removing all vertices and edges from all graphs.
@@ -516,7 +846,7 @@ class TigerGraphConnection(object):
         - `force`: If `True`, forces the retrieval the schema details again, otherwise returns a cached copy of vertex type details (if they were already fetched previously).
         """
         ret = []
-        for vt in self.getSchema(force=force)["VertexTypes"]:
+        for vt in self.getSchema(full=False, force=force)["VertexTypes"]:
             ret.append(vt["Name"])
         return ret
 
@@ -526,10 +856,7 @@ class TigerGraphConnection(object):
         Arguments:
         - `force`: If `True`, forces the retrieval the schema details again, otherwise returns a cached copy of vertex type details (if they were already fetched previously).
         """
-        for vt in self.getSchema(force=force)["VertexTypes"]:
-            if vt["Name"] == vertexType:
-                return vt
-        return {}  # Vertex type was not found
+        return self._getSchemaObject("VertexTypes", vertexType, force)  # Empty dictionary if vertex type was not found
 
     def getVertexCount(self, vertexType, where=""):
         """Returns the number of vertices.
@@ -552,10 +879,10 @@ class TigerGraphConnection(object):
         if where:
             if vertexType == "*":
                 raise TigerGraphException("VertexType cannot be \"*\" if where condition is specified.", None)
-            res = self._get(self.restppUrl + "/graph/" + self.graphname + "/vertices/" + vertexType + "?count_only=true&filter=" + where)
+            res = self._get(self._graphUrl + "/vertices/" + vertexType + _queryString([("count_only", "true"), ("filter", where)]))
         else:
-            data = '{"function":"stat_vertex_number","type":"' + vertexType + '"}'
-            res = self._post(self.restppUrl + "/builtins/" + self.graphname, data=data)
+            data = _encode({"function": "stat_vertex_number", "type": vertexType})
+            res = self._post(self._builtinsUrl, data=data)
         if len(res) == 1 and res[0]["v_type"] == vertexType:
             return res[0]["count"]
         ret = {}
@@ -586,8 +913,8 @@ class TigerGraphConnection(object):
         if not isinstance(attributes, dict):
             return None
         vals = self._upsertAttrs(attributes)
-        data = json.dumps({"vertices": {vertexType: {vertexId: vals}}})
-        return self._post(self.restppUrl + "/graph/" + self.graphname, data=data)[0]["accepted_vertices"]
+        data = _encode({"vertices": {vertexType: {vertexId: vals}}})
+        return self._post(self._graphUrl, data=data)[0]["accepted_vertices"]
 
     def upsertVertices(self, vertexType, vertices):
         """Upserts multiple vertices (of the same type).
@@ -619,8 +946,8 @@ class TigerGraphConnection(object):
         for v in vertices:
             vals = self._upsertAttrs(v[1])
             data[v[0]] = vals
-        data = json.dumps({"vertices": {vertexType: data}})
-        return self._post(self.restppUrl + "/graph/" + self.graphname, data=data)[0]["accepted_vertices"]
+        data = _encode({"vertices": {vertexType: data}})
+        return self._post(self._graphUrl, data=data)[0]["accepted_vertices"]
 
     def getVertices(self, vertexType, select="", where="", limit="", sort="", fmt="py", withId=True, withType=False, timeout=0):
         """Retrieves vertices of the given vertex type.
@@ -649,27 +976,16 @@ class TigerGraphConnection(object):
         Endpoint:      GET /graph/{graph_name}/vertices
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-graph-graph_name-vertices
         """
-        url = self.restppUrl + "/graph/" + self.graphname + "/vertices/" + vertexType
-        isFirst = True
-        if select:
-            url += "?select=" + select
-            isFirst = False
-        if where:
-            url += ("?" if isFirst else "&") + "filter=" + where
-            isFirst = False
-        if limit:
-            url += ("?" if isFirst else "&") + "limit=" + str(limit)
-            isFirst = False
-        if sort:
-            url += ("?" if isFirst else "&") + "sort=" + sort
-            isFirst = False
-        if timeout and timeout > 0:
-            url += ("?" if isFirst else "&") + "timeout=" + str(timeout)
+        url = self._graphUrl + "/vertices/" + vertexType
+        _checkIdentList("select", select)
+        _checkIdentList("sort", sort)
+        url += _queryString([("select", select), ("filter", where), ("limit", limit), ("sort", sort),
+                             ("timeout", timeout if timeout and timeout > 0 else None)])
 
         ret = self._get(url)
 
         if fmt == "json":
-            return json.dumps(ret)
+            return _dumps(ret)
         if fmt == "df":
             return self.vertexSetToDataFrame(ret, withId, withType)
         return ret
@@ -699,21 +1015,20 @@ class TigerGraphConnection(object):
         """
         if not vertexIds:
             raise TigerGraphException("No vertex ID was specified.", None)
-        vids = []
-        if isinstance(vertexIds, (int, str)):
-            vids.append(vertexIds)
-        elif not isinstance(vertexIds, list):
-            return None  # TODO: a better return value?
-        else:
+        if isinstance(vertexIds, list):
             vids = vertexIds
-        url = self.restppUrl + "/graph/" + self.graphname + "/vertices/" + vertexType + "/"
+        elif isinstance(vertexIds, (int, str)):
+            vids = [vertexIds]
+        else:
+            return None  # TODO: a better return value?
+        url = self._graphUrl + "/vertices/" + vertexType + "/"
 
         ret = []
-        for vid in vids:
-            ret += self._get(url + str(vid))
+        for res in _parallel(lambda vid: self._get(url + str(vid)), vids):
+            ret.extend(res)
 
         if fmt == "json":
-            return json.dumps(ret)
+            return _dumps(ret)
         if fmt == "df":
             return self.vertexSetToDataFrame(ret, withId, withType)
         return ret
@@ -744,10 +1059,9 @@ class TigerGraphConnection(object):
             vts = vertexTypes
         else:
             return None
+        resp = _parallel(lambda vt: self._post(self._builtinsUrl, data=_encode({"function": "stat_vertex_attr", "type": vt}), resKey="", skipCheck=True), vts)
         ret = {}
-        for vt in vts:
-            data = '{"function":"stat_vertex_attr","type":"' + vt + '"}'
-            res = self._post(self.restppUrl + "/builtins/" + self.graphname, data=data, resKey="", skipCheck=True)
+        for vt, res in zip(vts, resp):
             if res["error"]:
                 if "stat_vertex_attr is skipped" in res["message"]:
                     if not skipNA:
@@ -784,19 +1098,12 @@ class TigerGraphConnection(object):
         Endpoint:      DELETE /graph/{graph_name}/vertices
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#delete-graph-graph_name-vertices
         """
-        url = self.restppUrl + "/graph/" + self.graphname + "/vertices/" + vertexType
-        isFirst = True
-        if where:
-            url += "?filter=" + where
-            isFirst = False
-        if limit and sort:  # These two must be provided together
-            url += ("?" if isFirst else "&") + "limit=" + str(limit) + "&sort=" + sort
-            isFirst = False
-        if permanent:
-            url += ("?" if isFirst else "&") + "permanent=true"
-            isFirst = False
-        if timeout and timeout > 0:
-            url += ("?" if isFirst else "&") + "timeout=" + str(timeout)
+        url = self._graphUrl + "/vertices/" + vertexType
+        _checkIdentList("sort", sort)
+        url += _queryString([("filter", where),
+                             ("limit", limit if sort else None), ("sort", sort if limit else None),  # These two must be provided together
+                             ("permanent", "true" if permanent else None),
+                             ("timeout", timeout if timeout and timeout > 0 else None)])
         return self._delete(url)["deleted_vertices"]
 
     def delVerticesById(self, vertexType, vertexIds, permanent=False, timeout=0):
@@ -814,23 +1121,19 @@ class TigerGraphConnection(object):
         """
         if not vertexIds:
             raise TigerGraphException("No vertex ID was not specified.", None)
-        vids = []
-        if isinstance(vertexIds, (int, str)):
-            vids.append(vertexIds)
-        elif not isinstance(vertexIds, list):
-            return None  # TODO: a better return value?
-        else:
+        if isinstance(vertexIds, list):
             vids = vertexIds
-        url1 = self.restppUrl + "/graph/" + self.graphname + "/vertices/" + vertexType + "/"
+        elif isinstance(vertexIds, (int, str)):
+            vids = [vertexIds]
+        else:
+            return None  # TODO: a better return value?
+        url1 = self._graphUrl + "/vertices/" + vertexType + "/"
         url2 = ""
         if permanent:
             url2 = "?permanent=true"
         if timeout and timeout > 0:
             url2 += ("&" if url2 else "?") + "timeout=" + str(timeout)
-        ret = 0
-        for vid in vids:
-            ret += self._delete(url1 + str(vid) + url2)["deleted_vertices"]
-        return ret
+        return sum(res["deleted_vertices"] for res in _parallel(lambda vid: self._delete(url1 + str(vid) + url2), vids))
 
     # Edge related functions ===================================================
 
@@ -841,7 +1144,7 @@ class TigerGraphConnection(object):
         - `force`: If `True`, forces the retrieval the schema details again, otherwise returns a cached copy of edge type details (if they were already fetched previously).
         """
         ret = []
-        for et in self.getSchema(force=force)["EdgeTypes"]:
+        for et in self.getSchema(full=False, force=force)["EdgeTypes"]:
             ret.append(et["Name"])
         return ret
 
@@ -852,10 +1155,7 @@ class TigerGraphConnection(object):
         - `edgeType`: The name of the edge type.
         - `force`: If `True`, forces the retrieval the schema details again, otherwise returns a cached copy of edge type details (if they were already fetched previously).
         """
-        for et in self.getSchema(force=force)["EdgeTypes"]:
-            if et["Name"] == edgeType:
-                return et
-        return {}
+        return self._getSchemaObject("EdgeTypes", edgeType, force)
 
     def getEdgeSourceVertexType(self, edgeType):
         """Returns the type(s) of the edge type's source vertex.
@@ -873,22 +1173,7 @@ class TigerGraphConnection(object):
             Note: The returned set contains all source vertex types, but does not certainly mean that the edge is defined between all source and all target
                   vertex types. You need to look at the individual source/target pairs to find out which combinations are valid/defined.
         """
-        edgeTypeDetails = self.getEdgeType(edgeType)
-
-        # Edge type with a single source vertex type
-        if edgeTypeDetails["FromVertexTypeName"] != "*":
-            return edgeTypeDetails["FromVertexTypeName"]
-
-        # Edge type with multiple source vertex types
-        if "EdgePairs" in edgeTypeDetails:
-            # v3.0 and later notation
-            vts = set()
-            for ep in edgeTypeDetails["EdgePairs"]:
-                vts.add(ep["From"])
-            return vts
-        else:
-            # 2.6.1 and earlier notation
-            return "*"
+        return self._getEdgeVertexType(edgeType, "From")
 
     def getEdgeTargetVertexType(self, edgeType):
         """Returns the type(s) of the edge type's target vertex.
@@ -906,22 +1191,35 @@ class TigerGraphConnection(object):
             Note: The returned set contains all target vertex types, but does not certainly mean that the edge is defined between all source and all target
                   vertex types. You need to look at the individual source/target pairs to find out which combinations are valid/defined..
         """
-        edgeTypeDetails = self.getEdgeType(edgeType)
+        return self._getEdgeVertexType(edgeType, "To")
 
-        # Edge type with a single target vertex type
-        if edgeTypeDetails["ToVertexTypeName"] != "*":
-            return edgeTypeDetails["ToVertexTypeName"]
-
-        # Edge type with multiple target vertex types
-        if "EdgePairs" in edgeTypeDetails:
-            # v3.0 and later notation
-            vts = set()
-            for ep in edgeTypeDetails["EdgePairs"]:
-                vts.add(ep["To"])
-            return vts
-        else:
-            # 2.6.1 and earlier notation
-            return "*"
+    def _getEdgeVertexType(self, edgeType, end):
+        """Returns the type(s) of the edge type's source or target vertex; see `getEdgeSourceVertexType` for details.
+
+        The results are cached along with the schema, as they do not change unless the schema is changed.
+
+        Arguments:
+        - `edgeType`: The name of the edge type.
+        - `end`:      "From" for the source vertex type(s) or "To" for the target vertex type(s).
+        """
+        self.getSchema(full=False)  # Makes sure that the cached lookup tables belong to the current graph and schema
+        idx = self._schemaIndex.setdefault(end + "VertexTypes", {})
+        if edgeType not in idx:
+            edgeTypeDetails = self.getEdgeType(edgeType)
+
+            if edgeTypeDetails[end + "VertexTypeName"] != "*":
+                # Edge type with a single vertex type
+                idx[edgeType] = edgeTypeDetails[end + "VertexTypeName"]
+            elif "EdgePairs" in edgeTypeDetails:
+                # Edge type with multiple vertex types; v3.0 and later notation
+                idx[edgeType] = {ep[end] for ep in edgeTypeDetails["EdgePairs"]}
+            else:
+                # Edge type with multiple vertex types; 2.6.1 and earlier notation
+                idx[edgeType] = "*"
+        ret = idx[edgeType]
+        if isinstance(ret, set):
+            return set(ret)  # A copy, so that the cached value cannot be modified by the caller
+        return ret
 
     def isDirected(self, edgeType):
         """Is the specified edge type directed?
@@ -937,9 +1235,10 @@ class TigerGraphConnection(object):
         Arguments:
         - `edgeType`: The name of the edge type.
         """
-        if not self.isDirected(edgeType):
+        edgeTypeDetails = self.getEdgeType(edgeType)
+        if not edgeTypeDetails["IsDirected"]:
             return None
-        config = self.getEdgeType(edgeType)["Config"]
+        config = edgeTypeDetails["Config"]
         if "REVERSE_EDGE" in config:
             return config["REVERSE_EDGE"]
         return None
@@ -975,25 +1274,19 @@ class TigerGraphConnection(object):
         if where or (sourceVertexType and sourceVertexId):
             if not sourceVertexType or not sourceVertexId:
                 raise TigerGraphException("If where condition is specified, then both sourceVertexType and sourceVertexId must be provided too.", None)
-            url = self.restppUrl + "/graph/" + self.graphname + "/edges/" + sourceVertexType + "/" + str(sourceVertexId)
-            if edgeType:
-                url += "/" + edgeType
-                if targetVertexType:
-                    url += "/" + targetVertexType
-                    if targetVertexId:
-                        url += "/" + str(targetVertexId)
-            url += "?count_only=true"
-            if where:
-                url += "&filter=" + where
+            url = self._edgesUrl(sourceVertexType, sourceVertexId, edgeType, targetVertexType, targetVertexId)
+            url += _queryString([("count_only", "true"), ("filter", where)])
             res = self._get(url)
         else:
             if not edgeType:  # TODO is this a valid check?
                 raise TigerGraphException("A valid edge type or \"*\" must be specified for edge type.", None)
-            data = '{"function":"stat_edge_number","type":"' + edgeType + '"' \
-                + (',"from_type":"' + sourceVertexType + '"' if sourceVertexType else '')  \
-                + (',"to_type":"' + targetVertexType + '"' if targetVertexType else '')  \
-                + '}'
-            res = self._post(self.restppUrl + "/builtins/" + self.graphname, data=data)
+            data = {"function": "stat_edge_number", "type": edgeType}
+            if sourceVertexType:
+                data["from_type"] = sourceVertexType
+            if targetVertexType:
+                data["to_type"] = targetVertexType
+            data = _encode(data)
+            res = self._post(self._builtinsUrl, data=data)
         if len(res) == 1 and res[0]["e_type"] == edgeType:
             return res[0]["count"]
         ret = {}
@@ -1037,8 +1330,8 @@ class TigerGraphConnection(object):
         if not isinstance(attributes, dict):
             return None
         vals = self._upsertAttrs(attributes)
-        data = json.dumps({"edges": {sourceVertexType: {sourceVertexId: {edgeType: {targetVertexType: {targetVertexId: vals}}}}}})
-        return self._post(self.restppUrl + "/graph/" + self.graphname, data=data)[0]["accepted_edges"]
+        data = _encode({"edges": {sourceVertexType: {sourceVertexId: {edgeType: {targetVertexType: {targetVertexId: vals}}}}}})
+        return self._post(self._graphUrl, data=data)[0]["accepted_edges"]
 
     def upsertEdges(self, sourceVertexType, edgeType, targetVertexType, edges):
         """Upserts multiple edges (of the same type).
@@ -1068,27 +1361,22 @@ class TigerGraphConnection(object):
             return None
         data = {sourceVertexType: {}}
         l1 = data[sourceVertexType]
+        targets = {}  # Source vertex ID -> its target vertex map (the innermost level of the payload)
         for e in edges:
             if len(e) > 2:
                 vals = self._upsertAttrs(e[2])
             else:
                 vals = {}
-            # fromVertexId
-            if e[0] not in l1:
-                l1[e[0]] = {}
-            l2 = l1[e[0]]
-            # edgeType
-            if edgeType not in l2:
-                l2[edgeType] = {}
-            l3 = l2[edgeType]
-            # targetVertexType
-            if targetVertexType not in l3:
-                l3[targetVertexType] = {}
-            l4 = l3[targetVertexType]
+            # fromVertexId; edge type and target vertex type are the same for all edges, so the levels below the source vertex
+            #   are created together with it and its target vertex map is tracked separately
+            l4 = targets.get(e[0])
+            if l4 is None:
+                l4 = targets[e[0]] = {}
+                l1[e[0]] = {edgeType: {targetVertexType: l4}}
             # targetVertexId
             l4[e[1]] = vals
-        data = json.dumps({"edges": data})
-        return self._post(self.restppUrl + "/graph/" + self.graphname, data=data)[0]["accepted_edges"]
+        data = _encode({"edges": data})
+        return self._post(self._graphUrl, data=data)[0]["accepted_edges"]
 
     def getEdges(self, sourceVertexType, sourceVertexId, edgeType=None, targetVertexType=None, targetVertexId=None, select="", where="", limit="", sort="", fmt="py", withId=True, withType=False, timeout=0):
         """Retrieves edges of the given edge type originating from a specific source vertex.
@@ -1121,32 +1409,15 @@ class TigerGraphConnection(object):
         # TODO: change sourceVertexId to sourceVertexIds and allow passing both number and list as parameter
         if not sourceVertexType or not sourceVertexId:
             raise TigerGraphException("Both source vertex type and source vertex ID must be provided.", None)
-        url = self.restppUrl + "/graph/" + self.graphname + "/edges/" + sourceVertexType + "/" + str(sourceVertexId)
-        if edgeType:
-            url += "/" + edgeType
-            if targetVertexType:
-                url += "/" + targetVertexType
-                if targetVertexId:
-                    url += "/" + str(targetVertexId)
-        isFirst = True
-        if select:
-            url += "?select=" + select
-            isFirst = False
-        if where:
-            url += ("?" if isFirst else "&") + "filter=" + where
-            isFirst = False
-        if limit:
-            url += ("?" if isFirst else "&") + "limit=" + str(limit)
-            isFirst = False
-        if sort:
-            url += ("?" if isFirst else "&") + "sort=" + sort
-            isFirst = False
-        if timeout and timeout > 0:
-            url += ("?" if isFirst else "&") + "timeout=" + str(timeout)
+        url = self._edgesUrl(sourceVertexType, sourceVertexId, edgeType, targetVertexType, targetVertexId)
+        _checkIdentList("select", select)
+        _checkIdentList("sort", sort)
+        url += _queryString([("select", select), ("filter", where), ("limit", limit), ("sort", sort),
+                             ("timeout", timeout if timeout and timeout > 0 else None)])
         ret = self._get(url)
 
         if fmt == "json":
-            return json.dumps(ret)
+            return _dumps(ret)
         if fmt == "df":
             return self.edgeSetToDataFrame(ret, withId, withType)
         return ret
@@ -1191,27 +1462,12 @@ class TigerGraphConnection(object):
         if self.ttkGetEF:  # If installed version is available, use it, as it can return edge attributes too.
             ret = self.runInstalledQuery("ttk_getEdgesFrom", {"edgeType": edgeType, "sourceVertexType": sourceVertexType})
         else:  # If installed version is not available, use interpreted version. Always available, but couldn't return attributes before v3.0.
-            queryText = \
-                'INTERPRET QUERY () FOR GRAPH $graph { \
-                    SetAccum<EDGE> @@edges; \
-                    start = {ANY}; \
-                    res = \
-                        SELECT s \
-                        FROM   start:s-(:e)->ANY:t \
-                        WHERE  e.type == "$edgeType" \
-                           AND s.type == "$sourceEdgeType" \
-                        ACCUM  @@edges += e; \
-                    PRINT @@edges AS edges; \
-             }'
-
-            queryText = queryText.replace("$graph",          self.graphname) \
-                                 .replace('$sourceEdgeType', sourceVertexType) \
-                                 .replace('$edgeType',       edgeType)
+            queryText = _GET_EDGES_QUERY.substitute(graph=self.graphname, sourceEdgeType=sourceVertexType, edgeType=edgeType)
             ret = self.runInterpretedQuery(queryText)
         ret = ret[0]["edges"]
 
         if fmt == "json":
-            return json.dumps(ret)
+            return _dumps(ret)
         if fmt == "df":
             return self.edgeSetToDataFrame(ret, withId, withType)
         return ret
@@ -1237,10 +1493,9 @@ class TigerGraphConnection(object):
             ets = edgeTypes
         else:
             return None
+        resp = _parallel(lambda et: self._post(self._builtinsUrl, data=_encode({"function": "stat_edge_attr", "type": et, "from_type": "*", "to_type": "*"}), resKey="", skipCheck=True), ets)
         ret = {}
-        for et in ets:
-            data = '{"function":"stat_edge_attr","type":"' + et + '","from_type":"*","to_type":"*"}'
-            res = self._post(self.restppUrl + "/builtins/" + self.graphname, data=data, resKey="", skipCheck=True)
+        for et, res in zip(ets, resp):
             if res["error"]:
                 if "stat_edge_attr is skiped" in res["message"]:
                     if not skipNA:
@@ -1277,22 +1532,11 @@ class TigerGraphConnection(object):
         """
         if not sourceVertexType or not sourceVertexId:
             raise TigerGraphException("Both sourceVertexType and sourceVertexId must be provided.", None)
-        url = self.restppUrl + "/graph/" + self.graphname + "/edges/" + sourceVertexType + "/" + str(sourceVertexId)
-        if edgeType:
-            url += "/" + edgeType
-            if targetVertexType:
-                url += "/" + targetVertexType
-                if targetVertexId:
-                    url += "/" + str(targetVertexId)
-        isFirst = True
-        if where:
-            url += ("?" if isFirst else "&") + "filter=" + where
-            isFirst = False
-        if limit and sort:  # These two must be provided together
-            url += ("?" if isFirst else "&") + "limit=" + str(limit) + "&sort=" + sort
-            isFirst = False
-        if timeout and timeout > 0:
-            url += ("?" if isFirst else "&") + "timeout=" + str(timeout)
+        url = self._edgesUrl(sourceVertexType, sourceVertexId, edgeType, targetVertexType, targetVertexId)
+        _checkIdentList("sort", sort)
+        url += _queryString([("filter", where),
+                             ("limit", limit if sort else None), ("sort", sort if limit else None),  # These two must be provided together
+                             ("timeout", timeout if timeout and timeout > 0 else None)])
         res = self._delete(url)
         ret = {}
         for r in res:
@@ -1313,7 +1557,7 @@ class TigerGraphConnection(object):
         """
         ret = self.getEndpoints(dynamic=True)
         if fmt == "json":
-            return json.dumps(ret)
+            return _dumps(ret)
         if fmt == "df":
             return pd.DataFrame(ret).T
         return ret
@@ -1334,20 +1578,13 @@ class TigerGraphConnection(object):
         Endpoint:      POST /query/{graph_name}/<query_name>
         Documentation: https://docs.tigergraph.com/dev/gsql-ref/querying/query-operations#running-a-query
         """
-        query1 = ""
-        for param in params.keys():
-            if " " in params[param]:
-                params[param] = urllib.parse.quote(params[param])  # ' ' ==> %20 HTML Format
-            query1 += param + "=" + params[param] + "&"
-        if query1[-1] == "&":
-            query1 = query1[:-1]
-
-        headers = {}
-        if timeout:
-            headers["GSQL-TIMEOUT"] = str(timeout)
-        if sizeLimit:
-            headers["RESPONSE-LIMIT"] = str(sizeLimit)
-        return self._get(self.restppUrl + "/query/" + self.graphname + "/" + queryName + "?" + query1, headers=headers)
+        if isinstance(params, dict):
+            # Values are percent-encoded (' ' ==> %20); list values (e.g. for SET or BAG parameters) are passed as repeated parameters
+            query1 = urllib.parse.urlencode(params, doseq=True, quote_via=urllib.parse.quote)
+        else:
+            query1 = params or ""
+
+        return self._get(self._queryUrl + queryName + ("?" + query1 if query1 else ""), headers=_queryHeaders(timeout, sizeLimit))
 
     def runInterpretedQuery(self, queryText, params=None, timeout=None, sizeLimit=None):
         """Runs an interpreted query.
@@ -1373,15 +1610,12 @@ class TigerGraphConnection(object):
         Endpoint:      POST /gsqlserver/interpreted_query
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#post-gsqlserver-interpreted_query-run-an-interpreted-query
         """
-        queryText = queryText.replace("$graphname", self.graphname)
+        if "$graphname" in queryText:
+            queryText = queryText.replace("$graphname", self.graphname)
         if self.debug:
-            print(queryText)
-        headers = {}
-        if timeout:
-            headers["GSQL-TIMEOUT"] = str(timeout)
-        if sizeLimit:
-            headers["RESPONSE-LIMIT"] = str(sizeLimit)
-        return self._post(self.gsUrl + "/gsqlserver/interpreted_query", data=queryText, params=params, authMode="pwd", headers=headers)
+            self._log(queryText)
+        return self._post(self.gsUrl + "/gsqlserver/interpreted_query", data=queryText, params=params, authMode="pwd",
+                          headers=_queryHeaders(timeout, sizeLimit))
 
     # TODO: GET /showprocesslist/{graph_name}
     #       https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-running-queries-showprocesslist-graph_name
@@ -1399,7 +1633,8 @@ class TigerGraphConnection(object):
             (after some transformation) to pass a subgraph to a visualisation component.
 
         Arguments:
-        - `output`:    The data structure returned by `runInstalledQuery()` or `runInterpretedQuery()`
+        - `output`:    The data structure returned by `runInstalledQuery()` or `runInterpretedQuery()`, or the raw JSON response of a query
+                       (as a string or bytes, e.g. when the query was run by other means); the latter is parsed with orjson, if available.
         - `graphOnly`: Should output be restricted to vertices and edges (True, default) or should any other output (e.g. values of
                        variables or accumulators, or plain text printed) be captured as well.
 
@@ -1408,91 +1643,82 @@ class TigerGraphConnection(object):
             dictionaries containing the key/value pairs of any other output.
         """
 
-        def attCopy(src, trg):
-            """Copies the attributes of a vertex or edge into another vertex or edge, respectively."""
-            srca = src["attributes"]
-            trga = trg["attributes"]
-            for att in srca:
-                trga[att] = srca[att]
-
-        def addOccurrences(obj, src):
-            """Counts and lists te occurrences of a vertex or edge.
-            A given vertex or edge can appear multiple times (in different vertex or edge sets) in the output of a query.
-            Each output has a label (either the variable name or an alias used in the PRINT statement), `x_sources` contains a list of these labels.
-            """
-            if "x_occurrences" in obj:
-                obj["x_occurrences"] += 1
-            else:
-                obj["x_occurrences"] = 1
-            if "x_sources" in obj:
-                obj["x_sources"].append(src)
-            else:
-                obj["x_sources"] = [src]
+        if isinstance(output, (str, bytes, bytearray)):
+            output = _loads(output)
+            if isinstance(output, dict):  # The complete response document, not just its results
+                self._errorCheck(output)
+                output = output["results"]
 
         vs = {}
         es = {}
         ou = []
+        revEdges = {}  # Reverse edge name (or None) of each edge type encountered
+        # A given vertex or edge can appear multiple times (in different vertex or edge sets) in the output of a query. Their first
+        #   instance is kept, with the attributes of the later ones copied into it; `x_occurrences` counts the occurrences and
+        #   `x_sources` lists the labels (either the variable name or an alias used in the PRINT statement) of the sets they appeared in.
+        # Bound methods used for every vertex/edge, looked up only once
+        vsSetdefault = vs.setdefault
+        esSetdefault = es.setdefault
 
         # Outermost data type is a list
         for o1 in output:
             # Next level data type is dictionary that could be vertex sets, edge sets or generic output (of simple or complex data types)
             for o2 in o1:
                 _o2 = o1[o2]
-                if isinstance(_o2, list) and len(_o2) > 0 and isinstance(_o2[0], dict):  # Is it an array of dictionaries?
-                    for o3 in _o2:  # Iterate through the array
-                        if "v_type" in o3:  # It's a vertex!
-
-                            # Handle vertex type first
-                            vType = o3["v_type"]
-                            vtm = {}
-                            if vType in vs:  # Do we have this type of vertices in our list (which is a dictionary, really)?
-                                vtm = vs[vType]
-                            else:  # No, let's create a dictionary for them and add to the list
-                                vtm = {}
-                                vs[vType] = vtm
-
-                            # Then handle the vertex itself
-                            vId = o3["v_id"]
-                            if vId in vtm:  # Do we have this specific vertex (identified by the ID) in our list?
-                                tmp = vtm[vId]
-                                attCopy(o3, tmp)
-                                addOccurrences(tmp, o2)
-                            else:  # No, add it
-                                addOccurrences(o3, o2)
-                                vtm[vId] = o3
-
-                        elif "e_type" in o3:  # It's an edge!
-
-                            # Handle edge type first
-                            eType = o3["e_type"]
-                            etm = {}
-                            if eType in es:  # Do we have this type of edges in our list (which is a dictionary, really)?
-                                etm = es[eType]
-                            else:  # No, let's create a dictionary for them and add to the list
-                                etm = {}
-                                es[eType] = etm
-
-                            # Then handle the edge itself
-                            eId = o3["from_type"] + "(" + o3["from_id"] + ")->" + o3["to_type"] + "(" + o3["to_id"] + ")"
-                            o3["e_id"] = eId
-
-                            # Add reverse edge name, if applicable
-                            if self.isDirected(eType):
-                                rev = self.getReverseEdge(eType)
-                                if rev:
-                                    o3["reverse_edge"] = rev
-
-                            if eId in etm:  # Do we have this specific edge (identified by the composite ID) in our list?
-                                tmp = etm[eId]
-                                attCopy(o3, tmp)
-                                addOccurrences(tmp, o2)
-                            else:  # No, add it
-                                addOccurrences(o3, o2)
-                                etm[eId] = o3
-
-                        else:  # It's a ... something else
-                            ou.append({"label": o2, "value": _o2})
-                else:  # It's a ... something else
+                # Vertex and edge sets are arrays of dictionaries and they are homogeneous, so their first item tells what they contain
+                first = _o2[0] if isinstance(_o2, list) and _o2 else None
+                if isinstance(first, dict) and "v_type" in first:  # It's a vertex set!
+                    for o3 in _o2:
+
+                        # Handle vertex type first
+                        #   (if we don't have this type of vertices in our list (which is a dictionary, really) yet, a dictionary is
+                        #   created for them)
+                        vtm = vsSetdefault(o3["v_type"], {})
+
+                        # Then handle the vertex itself
+                        vId = o3["v_id"]
+                        tmp = vtm.get(vId)
+                        if tmp is not None:  # Do we have this specific vertex (identified by the ID) in our list?
+                            tmp["attributes"].update(o3["attributes"])
+                            tmp["x_occurrences"] += 1
+                            tmp["x_sources"].append(o2)
+                        else:  # No, add it
+                            o3["x_occurrences"] = 1
+                            o3["x_sources"] = [o2]
+                            vtm[vId] = o3
+
+                elif isinstance(first, dict) and "e_type" in first:  # It's an edge set!
+                    for o3 in _o2:
+
+                        # Handle edge type first
+                        #   (if we don't have this type of edges in our list (which is a dictionary, really) yet, a dictionary is
+                        #   created for them)
+                        eType = o3["e_type"]
+                        etm = esSetdefault(eType, {})
+
+                        # Then handle the edge itself
+                        eId = "%s(%s)->%s(%s)" % (o3["from_type"], o3["from_id"], o3["to_type"], o3["to_id"])
+                        o3["e_id"] = eId
+
+                        # Add reverse edge name, if applicable (looked up once per edge type)
+                        if eType in revEdges:
+                            rev = revEdges[eType]
+                        else:
+                            rev = revEdges[eType] = self.getReverseEdge(eType)
+                        if rev:
+                            o3["reverse_edge"] = rev
+
+                        tmp = etm.get(eId)
+                        if tmp is not None:  # Do we have this specific edge (identified by the composite ID) in our list?
+                            tmp["attributes"].update(o3["attributes"])
+                            tmp["x_occurrences"] += 1
+                            tmp["x_sources"].append(o2)
+                        else:  # No, add it
+                            o3["x_occurrences"] = 1
+                            o3["x_sources"] = [o2]
+                            etm[eId] = o3
+
+                elif not graphOnly:  # It's a ... something else (and it is needed)
                     ou.append({"label": o2, "value": _o2})
 
         ret = {"vertices": vs, "edges": es}
@@ -1515,38 +1741,36 @@ class TigerGraphConnection(object):
                               Default is false, meaning that the endpoint will return only one path.
 
         See https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#input-parameters-and-output-format-for-path-finding for information on filters.
+
+        Returns the payload as a dictionary (to be serialised by the caller), or `None` if the source or target vertices are missing.
         """
 
+        def isValid(item, typeKey, valueKey):
+            """Is `item` a (type, value) tuple or a dictionary with the given keys?"""
+            return isinstance(item, tuple) or isinstance(item, dict) and typeKey in item and valueKey in item
+
         def parseVertices(vertices):
             """Parses vertex input parameters and converts it to the format required by the path finding endpoints."""
-            ret = []
             if not isinstance(vertices, list):
                 vertices = [vertices]
-            for v in vertices:
-                if isinstance(v, tuple):
-                    tmp = {"type": v[0], "id": v[1]}
-                    ret.append(tmp)
-                elif isinstance(v, dict) and "v_type" in v and "v_id" in v:
-                    tmp = {"type": v["v_type"], "id": v["v_id"]}
-                    ret.append(tmp)
-                elif self.debug:
-                    print("Invalid vertex type or value: " + str(v))
+            ret = [{"type": v[0], "id": v[1]} if isinstance(v, tuple) else {"type": v["v_type"], "id": v["v_id"]}
+                   for v in vertices if isValid(v, "v_type", "v_id")]
+            if self.debug and len(ret) < len(vertices):
+                for v in vertices:
+                    if not isValid(v, "v_type", "v_id"):
+                        self._log("Invalid vertex type or value: %s", v)
             return ret
 
         def parseFilters(filters):
             """Parses filter input parameters and converts it to the format required by the path finding endpoints."""
-            ret = []
             if not isinstance(filters, list):
                 filters = [filters]
-            for f in filters:
-                if isinstance(f, tuple):
-                    tmp = {"type": f[0], "condition": f[1]}
-                    ret.append(tmp)
-                elif isinstance(f, dict) and "type" in f and "condition" in f:
-                    tmp = {"type": f["type"], "condition": f["condition"]}
-                    ret.append(tmp)
-                elif self.debug:
-                    print("Invalid filter type or value: " + str(f))
+            ret = [{"type": f[0], "condition": f[1]} if isinstance(f, tuple) else {"type": f["type"], "condition": f["condition"]}
+                   for f in filters if isValid(f, "type", "condition")]
+            if self.debug and len(ret) < len(filters):
+                for f in filters:
+                    if not isValid(f, "type", "condition"):
+                        self._log("Invalid filter type or value: %s", f)
             return ret
 
         # Assembling the input payload
@@ -1562,7 +1786,7 @@ class TigerGraphConnection(object):
         if allShortestPaths:
             data["allShortestPaths"] = True
 
-        return json.dumps(data)
+        return data
 
     def shortestPath(self, sourceVertices, targetVertices, maxLength=None, vertexFilters=None, edgeFilters=None, allShortestPaths=False):
         """Find the shortest path (or all shortest paths) between the source and target vertex sets.
@@ -1582,7 +1806,7 @@ class TigerGraphConnection(object):
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#post-shortestpath-graphname-shortest-path-search
         """
         data = self._preparePathParams(sourceVertices, targetVertices, maxLength, vertexFilters, edgeFilters, allShortestPaths)
-        return self._post(self.restppUrl + "/shortestpath/" + self.graphname, data=data)
+        return self._post(self.restppUrl + "/shortestpath/" + self.graphname, data=_encode(data) if data else None)
 
     def allPaths(self, sourceVertices, targetVertices, maxLength, vertexFilters=None, edgeFilters=None):
         """Find all possible paths up to a given maximum path length between the source and target vertex sets.
@@ -1600,7 +1824,7 @@ class TigerGraphConnection(object):
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#post-allpaths-graphname-all-paths-search
         """
         data = self._preparePathParams(sourceVertices, targetVertices, maxLength, vertexFilters, edgeFilters)
-        return self._post(self.restppUrl + "/allpaths/" + self.graphname, data=data)
+        return self._post(self.restppUrl + "/allpaths/" + self.graphname, data=_encode(data) if data else None)
 
     # Pandas DataFrame support =================================================
 
@@ -1633,14 +1857,13 @@ class TigerGraphConnection(object):
 
         See: https://docs.tigergraph.com/dev/gsql-ref/querying/declaration-and-assignment-statements#vertex-set-variable-declaration-and-assignment
         """
-        df = pd.DataFrame(vertexSet)
-        cols = []
-        if withId:
-            cols.append(df["v_id"])
+        # The attributes are turned into columns directly; no intermediate DataFrame of the whole vertex set is built
+        ret = pd.DataFrame([v["attributes"] for v in vertexSet])
         if withType:
-            cols.append(df["v_type"])
-        cols.append(pd.DataFrame(df["attributes"].tolist()))
-        return pd.concat(cols, axis=1)
+            ret.insert(0, "v_type", [v["v_type"] for v in vertexSet], allow_duplicates=True)
+        if withId:
+            ret.insert(0, "v_id", [v["v_id"] for v in vertexSet], allow_duplicates=True)
+        return ret
 
     def edgeSetToDataFrame(self, edgeSet, withId=True, withType=False):
         """Converts an edge set to Pandas DataFrame.
@@ -1690,16 +1913,16 @@ class TigerGraphConnection(object):
                 ⋮
         ]
         """
-        df = pd.DataFrame(edgeSet)
-        cols = []
-        if withId:
-            cols.extend([df["from_type"], df["from_id"], df["to_type"], df["to_id"]])
+        # Same approach as in `vertexSetToDataFrame`: the attributes are materialised once, the other columns are inserted in front of them
+        ret = pd.DataFrame([e["attributes"] for e in edgeSet])
         if withType:
-            cols.append(df["e_type"])
-        cols.append(pd.DataFrame(df["attributes"].tolist()))
-        return pd.concat(cols, axis=1)
+            ret.insert(0, "e_type", [e["e_type"] for e in edgeSet], allow_duplicates=True)
+        if withId:
+            for i, col in enumerate(("from_type", "from_id", "to_type", "to_id")):
+                ret.insert(i, col, [e[col] for e in edgeSet], allow_duplicates=True)
+        return ret
 
-    def upsertVertexDataFrame(self, df, vertexType, v_id=None, attributes=None):
+    def upsertVertexDataFrame(self, df, vertexType, v_id=None, attributes=None, batchSize=None):
         """Upserts vertices from a Pandas DataFrame.
 
         Arguments:
@@ -1711,23 +1934,32 @@ class TigerGraphConnection(object):
                          in the dataframe and target is the attribute name in the graph vertex. When omitted
                          all columns would be upserted with their current names. In this case column names
                          must match the vertex's attribute names.
+        - `batchSize`:   The maximum number of vertices upserted in one request (a positive integer). If omitted, all vertices are
+                         upserted in a single request. Use it to limit the payload size (and memory usage) for large DataFrames.
 
         Returns: The number of vertices upserted.
         """
+        if batchSize is None:
+            batches = [df]
+        elif isinstance(batchSize, int) and not isinstance(batchSize, bool) and batchSize > 0:
+            batches = (df.iloc[i:i + batchSize] for i in range(0, len(df), batchSize))
+        else:
+            raise TigerGraphException("batchSize must be a positive integer: " + str(batchSize), None)
 
-        json_up = []
-
-        for index in df.index:
-
-            json_up.append(json.loads(df.loc[index].to_json()))
-            json_up[-1] = (
-                index if v_id is None else json_up[-1][v_id],
-                json_up[-1] if attributes is None
-                else {target: json_up[-1][source]
-                      for target, source in attributes.items()}
-            )
+        attrMap = list(attributes.items()) if attributes is not None else None
+        ret = 0
+        for batch in batches:
+            # The whole batch is serialised in one go (instead of row by row); this also keeps the column dtypes (e.g. integers are
+            #   not upcast to floats in rows that contain float values too)
+            json_up = [(
+                index if v_id is None else rec[v_id],
+                rec if attributes is None
+                else {target: rec[source]
+                      for target, source in attrMap}
+            ) for index, rec in zip(batch.index, _loads(batch.to_json(orient="records")))]
+            ret += self.upsertVertices(vertexType=vertexType, vertices=json_up)
 
-        return self.upsertVertices(vertexType=vertexType, vertices=json_up)
+        return ret
 
     def upsertEdgeDataFrame(self, df, sourceVertexType, edgeType, targetVertexType, from_id=None, to_id=None, attributes=None):
         """Upserts edges from a Pandas DataFrame.
@@ -1748,19 +1980,15 @@ class TigerGraphConnection(object):
 
         Returns: The number of edges upserted.
         """
-
-        json_up = []
-
-        for index in df.index:
-
-            json_up.append(json.loads(df.loc[index].to_json()))
-            json_up[-1] = (
-                index if from_id is None else json_up[-1][from_id],
-                index if to_id is None else json_up[-1][to_id],
-                json_up[-1] if attributes is None
-                else {target: json_up[-1][source]
-                      for target, source in attributes.items()}
-            )
+        # The whole DataFrame is serialised in one go instead of row by row; see `upsertVertexDataFrame`
+        attrMap = list(attributes.items()) if attributes is not None else None
+        json_up = [(
+            index if from_id is None else rec[from_id],
+            index if to_id is None else rec[to_id],
+            rec if attributes is None
+            else {target: rec[source]
+                  for target, source in attrMap}
+        ) for index, rec in zip(df.index, _loads(df.to_json(orient="records")))]
 
         return self.upsertEdges(
             sourceVertexType=sourceVertexType,
@@ -1771,7 +1999,7 @@ class TigerGraphConnection(object):
 
     # Authentication and security ==============================================
 
-    def getToken(self, secret, setToken=True, lifetime=None):
+    def getToken(self, secret, setToken=True, lifetime=None, force=False):
         """Requests an authorization token.
 
         This function returns a token only if REST++ authentication is enabled. If not, an exception will be raised.
@@ -1782,6 +2010,8 @@ class TigerGraphConnection(object):
                       See https://docs.tigergraph.com/admin/admin-guide/user-access-management/user-privileges-and-authentication#managing-credentials
         - `setToken`: Set the connection's API token to the new value (default: true).
         - `lifetime`: Duration of token validity (in secs, default 30 days = 2,592,000 secs).
+        - `force`:    If `True`, always requests a new token, otherwise returns the token requested previously by this connection with the
+                      same secret and lifetime (if it is still valid for at least 5 minutes).
 
         Returns a tuple of (<new_token>, <exporation_timestamp_unixtime>, <expiration_timestamp_ISO8601>).
                  Return value can be ignored.
@@ -1791,15 +2021,19 @@ class TigerGraphConnection(object):
         Endpoint:      GET /requesttoken
         Documentation: https://docs.tigergraph.com/dev/restpp-api/restpp-requests#requesting-a-token-with-get-requesttoken
         """
-        res = json.loads(requests.request("GET", self.restppUrl + "/requesttoken?secret=" + secret + ("&lifetime=" + str(lifetime) if lifetime else "")).text)
-        if not res["error"]:
-            if setToken:
-                self.apiToken   = res["token"]
-                self.authHeader = {'Authorization': "Bearer " + self.apiToken}
-            return res["token"], res["expiration"], datetime.utcfromtimestamp(res["expiration"]).strftime('%Y-%m-%d %H:%M:%S')
-        if "Endpoint is not found from url = /requesttoken" in res["message"]:
-            raise TigerGraphException("REST++ authentication is not enabled, can't generate token.", None)
-        raise TigerGraphException(res["message"], (res["code"] if "code" in res else None))
+        ret = self._tokenCache.get((secret, lifetime))
+        if force or not ret or ret[1] - time.time() < 300:
+            res = _loads(self._session.request("GET", self.restppUrl + "/requesttoken?secret=" + secret + ("&lifetime=" + str(lifetime) if lifetime else "")).content)
+            if res["error"]:
+                if "Endpoint is not found from url = /requesttoken" in res["message"]:
+                    raise TigerGraphException("REST++ authentication is not enabled, can't generate token.", None)
+                raise TigerGraphException(res["message"], (res["code"] if "code" in res else None))
+            ret = (res["token"], res["expiration"], datetime.utcfromtimestamp(res["expiration"]).strftime('%Y-%m-%d %H:%M:%S'))
+            self._tokenCache[(secret, lifetime)] = ret
+        if setToken:
+            self.apiToken   = ret[0]
+            self.authHeader = {'Authorization': "Bearer " + self.apiToken}
+        return ret
 
     def refreshToken(self, secret, token=None, lifetime=2592000):
         """Extends a token's lifetime.
@@ -1826,10 +2060,14 @@ class TigerGraphConnection(object):
         """
         if not token:
             token = self.apiToken
-        res = json.loads(requests.request("PUT", self.restppUrl + "/requesttoken?secret=" + secret + "&token=" + token + ("&lifetime=" + str(lifetime) if lifetime else "")).text)
+        res = _loads(self._session.request("PUT", self.restppUrl + "/requesttoken?secret=" + secret + "&token=" + token + ("&lifetime=" + str(lifetime) if lifetime else "")).content)
         if not res["error"]:
             exp = time.time() + res["expiration"]
-            return res["token"], int(exp), datetime.utcfromtimestamp(exp).strftime('%Y-%m-%d %H:%M:%S')
+            ret = (res["token"], int(exp), datetime.utcfromtimestamp(exp).strftime('%Y-%m-%d %H:%M:%S'))
+            for k, v in list(self._tokenCache.items()):
+                if v[0] == ret[0]:
+                    self._tokenCache[k] = ret
+            return ret
         if "Endpoint is not found from url = /requesttoken" in res["message"]:
             raise TigerGraphException("REST++ authentication is not enabled, can't refresh token.", None)
         raise TigerGraphException(res["message"], (res["code"] if "code" in res else None))
@@ -1853,7 +2091,10 @@ class TigerGraphConnection(object):
         """
         if not token:
             token = self.apiToken
-        res = json.loads(requests.request("DELETE", self.restppUrl + "/requesttoken?secret=" + secret + "&token=" + token).text)
+        res = _loads(self._session.request("DELETE", self.restppUrl + "/requesttoken?secret=" + secret + "&token=" + token).content)
+        for k, v in list(self._tokenCache.items()):
+            if v[0] == token:
+                del self._tokenCache[k]
         if not res["error"]:
             return True
         if res["code"] == "REST-3300" and skipNA:
@@ -1865,11 +2106,10 @@ class TigerGraphConnection(object):
     def createSecret(self, alias=""):
         """Issues a `CREATE SECRET` GSQL statement and returns the secret generated by that statement."""
         response = self.gsql("CREATE SECRET " + alias)
-        try:
-            secret = re.search('The secret\: (\w*)', response.replace('\n', ''))[1]
-            return secret
-        except:
-            return None
+        secret = _SECRET_RE.search(response.replace('\n', ''))
+        if secret:
+            return secret.group(1)
+        return None
 
     # TODO: showSecret()
 
@@ -1880,16 +2120,16 @@ class TigerGraphConnection(object):
                 self.certDownloaded = True
             else:
                 if self.debug:
-                    print("Downloading SSL certificate")
-                # TODO: Windows support
-
-                # Check if OpenSSL is installed.
-                if not shutil.which('openssl'):
-                    raise TigerGraphException("Could not find OpenSSL. Please install it.", None)
-
-                os.system("openssl s_client -connect " + self.serverUrl + " < /dev/null 2> /dev/null | openssl x509 -text > " + self.certPath)  # TODO: Python-native SSL?
-                if os.stat(self.certPath).st_size == 0:
+                    self._log("Downloading SSL certificate")
+                host, _, port = self.serverUrl.rpartition(":")
+                try:
+                    cert = ssl.get_server_certificate((host, int(port)))
+                except (OSError, ValueError):
+                    cert = ""
+                if not cert:
                     raise TigerGraphException("Certificate download failed. Please check that the server is online.", None)
+                with open(self.certPath, "w") as f:
+                    f.write(cert)
 
                 self.certDownloaded = True
 
@@ -1926,22 +2166,25 @@ class TigerGraphConnection(object):
             dyn = dynamic
             sta = static
         url = self.restppUrl + "/endpoints/" + self.graphname + "?"
+        kinds = [k for k, r in (("builtin", bui), ("dynamic", dyn), ("static", sta)) if r]
+        res = dict(zip(kinds, _parallel(lambda k: self._get(url + k + "=true", resKey=""), kinds)))
         if bui:
             eps = {}
-            res = self._get(url + "builtin=true", resKey="")
-            for ep in res:
-                if not re.search(" /graph/", ep) or re.search(" /graph/{graph_name}/", ep):
-                    eps[ep] = res[ep]
+            res1 = res["builtin"]
+            for ep in res1:
+                if " /graph/" not in ep or " /graph/{graph_name}/" in ep:
+                    eps[ep] = res1[ep]
             ret.update(eps)
         if dyn:
             eps = {}
-            res = self._get(url + "dynamic=true", resKey="")
-            for ep in res:
-                if re.search("^GET /query/" + self.graphname, ep):
-                    eps[ep] = res[ep]
+            res1 = res["dynamic"]
+            prefix = "GET /query/" + self.graphname
+            for ep in res1:
+                if ep.startswith(prefix):
+                    eps[ep] = res1[ep]
             ret.update(eps)
         if sta:
-            ret.update(self._get(url + "static=true", resKey=""))
+            ret.update(res["static"])
         return ret
 
     def getStatistics(self, seconds=10, segment=10):
@@ -1966,26 +2209,33 @@ class TigerGraphConnection(object):
             segment = max(min(segment, 0), 100)
         return self._get(self.restppUrl + "/statistics/" + self.graphname + "?seconds=" + str(seconds) + "&segment=" + str(segment), resKey="")
 
-    def getVersion(self, raw=False):
+    def getVersion(self, raw=False, force=False):
         """Retrieves the git versions of all components of the system.
 
+        Arguments:
+        - `raw`:   If `True`, returns the unprocessed response text of the endpoint (always retrieved again).
+        - `force`: If `True`, retrieves the version details again, otherwise returns a cached copy (if they were already fetched previously).
+
         Endpoint:      GET /version
         Documentation: https://docs.tigergraph.com/dev/restpp-api/built-in-endpoints#get-version
         """
-        response = requests.request("GET", self.restppUrl + "/version/" + self.graphname, headers=self.authHeader)
-        res = json.loads(response.text, strict=False)  # "strict=False" is why _get() was not used
+        if not raw and self._versions is not None and not force:
+            return list(self._versions)
+        response = self._session.request("GET", self.restppUrl + "/version/" + self.graphname, headers=self.authHeader).content.decode("utf-8")
+        res = json.loads(response, strict=False)  # "strict=False" is why _get() was not used
         self._errorCheck(res)
 
         if raw:
-            return response.text
+            return response
         res = res["message"].split("\n")
         components = []
-        for i in range(len(res)):
-            if 2 < i < len(res) - 1:
-                m = res[i].split()
-                component = {"name": m[0], "version": m[1], "hash": m[2], "datetime": m[3] + " " + m[4] + " " + m[5]}
-                components.append(component)
-        return components
+        for l in itertools.islice(res, 3, len(res) - 1):  # Skipping the header lines and the (empty) last line
+            m = l.split()
+            component = {"name": m[0], "version": m[1], "hash": m[2], "datetime": m[3] + " " + m[4] + " " + m[5]}
+            components.append(component)
+        self._versions = components
+        self._versionIndex = {c["name"]: c["version"] for c in components}
+        return list(components)
 
     def getVer(self, component="product", full=False):
         """Gets the version information of specific component.
@@ -1995,21 +2245,20 @@ class TigerGraphConnection(object):
 
         Get the full list of components using `getVersion`.
         """
-        ret = ""
-        for v in self.getVersion():
-            if v["name"] == component:
-                ret = v["version"]
+        if self._versions is None:
+            self.getVersion()
+        ret = self._versionIndex.get(component, "")
         if ret != "":
             if full:
                 return ret
-            ret = re.search("_.+_", ret)
+            ret = _VER_RE.search(ret)
             return ret.group().strip("_")
         else:
             raise TigerGraphException("\"" + component + "\" is not a valid component.", None)
 
     def getEdition(self):
         """Gets the database edition information"""
-        ret = self._get(self.restppUrl + "/graph/" + self.graphname + "/vertices/dummy", resKey="", skipCheck=True)
+        ret = self._get(self._graphUrl + "/vertices/dummy", resKey="", skipCheck=True)
         return ret["version"]["edition"]
 
     def getLicenseInfo(self):
@@ -2042,28 +2291,46 @@ class TigerGraphConnection(object):
         # Create a directory for the JAR file if it does not exist.
         if not os.path.exists(self.gsqlPath):
             if self.debug:
-                print("GSQL location was not found, creating")
+                self._log("GSQL location was not found, creating")
             os.mkdir(self.gsqlPath)
 
         # Download the gsql_client.jar file if not yet available locally
         if self.gsqlVersion:
             if self.debug:
-                print("Using version " + self.gsqlVersion + " instead of " + self.getVer())
+                self._log("Using version %s instead of %s", self.gsqlVersion, self.getVer())
         else:
             self.gsqlVersion = self.getVer()
         self.jarName = os.path.join(self.gsqlPath, 'gsql_client-' + self.gsqlVersion + ".jar")
         if not os.path.exists(self.jarName):
             if self.debug:
-                print("Jar not found, downloading to " + self.jarName)
+                self._log("Jar not found, downloading to %s", self.jarName)
             jar_url = ('https://bintray.com/api/ui/download/tigergraphecosys/tgjars/com/tigergraph/client/gsql_client/' + self.gsqlVersion + '/gsql_client-' + self.gsqlVersion + '.jar')
-            res = requests.get(jar_url)
-            if res.status_code == 404:
-                if self.debug:
-                    print(jar_url)
-                raise TigerGraphException("GSQL client v" + self.gsqlVersion + " could not be found. Check https://bintray.com/tigergraphecosys/tgjars/gsql_client for available versions.", res.status_code)
-            if res.status_code != 200:  # The client JAR was not successfully downloaded for whatever other reasons
-                res.raise_for_status()
-            open(self.jarName, 'wb').write(res.content)
+            with self._session.get(jar_url, stream=True) as res:  # Streamed to disk instead of being held in memory as a whole
+                if res.status_code == 404:
+                    if self.debug:
+                        self._log(jar_url)
+                    raise TigerGraphException("GSQL client v" + self.gsqlVersion + " could not be found. Check https://bintray.com/tigergraphecosys/tgjars/gsql_client for available versions.", res.status_code)
+                if res.status_code != 200:  # The client JAR was not successfully downloaded for whatever other reasons
+                    res.raise_for_status()
+                # Written under a temporary name first, so that an interrupted download does not leave a truncated JAR behind
+                with open(self.jarName + ".part", 'wb') as f:
+                    for chunk in res.iter_content(chunk_size=65536):
+                        f.write(chunk)
+            os.replace(self.jarName + ".part", self.jarName)
+
+        cmd = ['java', '-DGSQL_CLIENT_VERSION=v' + self.gsqlVersion.replace('.', '_'),
+               '-jar', self.jarName]
+
+        if self.useCert:
+            if not self.certDownloaded:
+                self.downloadCertificate()
+            cmd += ['-cacert', self.certPath]
+
+        cmd += [
+            '-u', self.username,
+            '-p', self.password,
+            '-ip', self.serverUrl]
+        self._gsqlCmd = cmd
 
         self.gsqlInitiated = True
 
@@ -2081,29 +2348,14 @@ class TigerGraphConnection(object):
         if options is None:
             options = ["-g", self.graphname]
 
-        cmd = ['java', '-DGSQL_CLIENT_VERSION=v' + self.gsqlVersion.replace('.', '_'),
-               '-jar', self.jarName]
-
-        if self.useCert:
-            cmd += ['-cacert', self.certPath]
-
-        cmd += [
-            '-u', self.username,
-            '-p', self.password,
-            '-ip', self.serverUrl]
-
-        comp = subprocess.run(cmd + options + [query],
+        comp = subprocess.run(self._gsqlCmd + options + [query],
                               stdout=subprocess.PIPE,
                               stderr=subprocess.PIPE)
 
         stdout = comp.stdout.decode()
         stderr = comp.stderr.decode()  # TODO: this should be parsed or handled some way, not ignored
         if self.debug:
-            print("-- stdout " + "-" * 70)
-            print(stdout)
-            print("-- stderr " + "-" * 70)
-            print(stderr)
-            print("-" * 80)
+            self._log("%s\n%s\n%s\n%s\n%s", _STDOUT_BANNER, stdout, _STDERR_BANNER, stderr, _BANNER_END)
 
         if "Connection refused." in stdout:
             if self.tgLocation.scheme == "https" and not self.useCert:
@@ -2112,9 +2364,9 @@ class TigerGraphConnection(object):
                 raise TigerGraphException("Connection to " + self.serverUrl + " was refused.", None)
 
         try:
-            json_string = re.search('(\{|\[).*$', stdout.replace('\n', ''))[0]
-            json_object = json.loads(json_string)
-        except:
+            json_string = _JSON_RE.search(stdout).group()
+            json_object = json.loads(json_string, strict=False)  # "strict=False" accepts line breaks within strings
+        except (AttributeError, ValueError):  # No JSON document in the output (or it is not a valid one)
             return stdout
         else:
             return json_object
@@ -2212,7 +2464,7 @@ class TigerGraphConnection(object):
                 "dataSources": ds
             }]
         }
-        data = json.dumps(data)
+        data = _encode(data)
 
         res = self._post(self.gsUrl + "/gsqlserver/gsql/loadingjobs?graph=" + self.graphname + "&action=start", data=data, authMode="pwd")[name]
         msg = res["message"]